@@ -5,25 +5,122 @@ GPU Diagnostics Script - Run this as a job to check GPU availability
 
 import os
 import torch
+import signal
 import subprocess
 import time
 
+try:
+    import pynvml
+except ImportError:
+    pynvml = None
+
+# Seconds to reuse nvidia-smi query results within one run
+GPU_QUERY_TTL = 1.0
+_gpu_query_cache = {}
+
+def hold(seconds):
+    """Keep the job alive for up to `seconds`, returning early on SIGUSR1"""
+    if seconds < 0:
+        raise ValueError(f"hold time must not be negative, got {seconds}")
+    if seconds == 0:
+        # signal.alarm(0) would cancel the alarm and leave pause() waiting forever
+        return
+    if not hasattr(signal, 'SIGUSR1'):
+        # No POSIX signals (e.g. Windows), so just wait out the full time
+        time.sleep(seconds)
+        return
+    
+    print(f"Release the GPU early with: kill -USR1 {os.getpid()}")
+    for signum in (signal.SIGUSR1, signal.SIGALRM):
+        signal.signal(signum, lambda *_: None)
+    signal.alarm(seconds)
+    signal.pause()
+    signal.alarm(0)
+
 def print_separator():
     print("-" * 80)
 
+def init_nvml():
+    """Initialize NVML once, falling back to nvidia-smi if it is unavailable"""
+    global pynvml
+    if pynvml is None:
+        return False
+    try:
+        pynvml.nvmlInit()
+        return True
+    except pynvml.NVMLError as e:
+        print(f"NVML unavailable ({e}), falling back to nvidia-smi")
+        pynvml = None
+        return False
+
+def _query_gpus_nvml():
+    """Query per-GPU stats through NVML"""
+    gpus = []
+    for i in range(pynvml.nvmlDeviceGetCount()):
+        handle = pynvml.nvmlDeviceGetHandleByIndex(i)
+        name = pynvml.nvmlDeviceGetName(handle)
+        memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+        gpus.append({
+            'id': i,
+            'name': name.decode() if isinstance(name, bytes) else name,
+            'used_memory': memory.used // 1024**2,
+            'total_memory': memory.total // 1024**2,
+            'utilization': pynvml.nvmlDeviceGetUtilizationRates(handle).gpu,
+            'temperature': pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)
+        })
+    return gpus
+
+def _query_gpus_smi():
+    """Query per-GPU stats from nvidia-smi in machine-readable form"""
+    output = subprocess.check_output([
+        "nvidia-smi",
+        "--query-gpu=index,name,memory.used,memory.total,utilization.gpu,temperature.gpu",
+        "--format=csv,noheader,nounits"
+    ], text=True)
+    gpus = []
+    for line in output.strip().splitlines():
+        index, name, used, total, util, temp = [p.strip() for p in line.split(',')]
+        gpus.append({
+            'id': index,
+            'name': name,
+            'used_memory': used,
+            'total_memory': total,
+            'utilization': util,
+            'temperature': temp
+        })
+    return gpus
+
+def query_gpus():
+    """Query per-GPU stats, preferring NVML over spawning nvidia-smi"""
+    cached = _gpu_query_cache.get('gpus')
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    
+    gpus = _query_gpus_nvml() if pynvml is not None else _query_gpus_smi()
+    _gpu_query_cache['gpus'] = (time.monotonic() + GPU_QUERY_TTL, gpus)
+    return gpus
+
+def print_gpu_table(gpus):
+    """Print GPU stats using the same columns as the client's gpus command"""
+    print(f"{'GPU ID':<8} {'NAME':<20} {'MEMORY':<18} {'UTIL %':<8} {'TEMP':<6}")
+    print("-" * 64)
+    for gpu in gpus:
+        memory_str = f"{gpu['used_memory']} / {gpu['total_memory']} MB"
+        print(f"{gpu['id']:<8} {gpu['name'][:20]:<20} {memory_str:<18} {gpu['utilization']:<8} {gpu['temperature']:<6}")
+
 def main():
     # Print environment variables
     print("=== ENVIRONMENT VARIABLES ===")
     print(f"CUDA_VISIBLE_DEVICES: {os.environ.get('CUDA_VISIBLE_DEVICES', 'Not set')}")
     print_separator()
     
-    # Print nvidia-smi output
-    print("=== NVIDIA-SMI OUTPUT ===")
+    # Print device usage as seen by the driver (covers all processes, not just PyTorch's allocator)
+    print("=== GPU STATUS ===")
     try:
-        nvidia_smi = subprocess.check_output(["nvidia-smi"], universal_newlines=True)
-        print(nvidia_smi)
+        init_nvml()
+        print_gpu_table(query_gpus())
     except Exception as e:
-        print(f"Error running nvidia-smi: {e}")
+        print(f"Error querying GPUs: {e}")
     print_separator()
     
     # PyTorch GPU information
@@ -33,8 +130,6 @@ def main():
         print(f"CUDA device count: {torch.cuda.device_count()}")
         for i in range(torch.cuda.device_count()):
             print(f"  Device {i}: {torch.cuda.get_device_name(i)}")
-            print(f"  Memory allocated: {torch.cuda.memory_allocated(i) / 1024**2:.2f} MB")
-            print(f"  Memory reserved: {torch.cuda.memory_reserved(i) / 1024**2:.2f} MB")
     else:
         print("No CUDA devices available to PyTorch")
     print_separator()
@@ -42,18 +137,30 @@ def main():
     # Try to use each GPU and report results
     print("=== GPU ACCESS TEST ===")
     if torch.cuda.is_available():
+        # Launch the test on every GPU at once, each on its own stream, then wait for all of them
+        launched = []
         for i in range(torch.cuda.device_count()):
             try:
                 print(f"Testing GPU {i}...")
                 device = torch.device(f"cuda:{i}")
-                # Create a small tensor on this device
-                x = torch.rand(1000, 1000, device=device)
-                # Do a simple operation
-                y = x @ x
+                stream = torch.cuda.Stream(device=device)
+                with torch.cuda.device(device), torch.cuda.stream(stream):
+                    # Half precision is plenty for a liveness probe and halves memory traffic
+                    x = torch.empty((1000, 1000), device=device, dtype=torch.float16)
+                    y = torch.empty_like(x)
+                    torch.rand(x.shape, out=x)
+                    # Do a simple operation
+                    torch.matmul(x, x, out=y)
+                    done = torch.cuda.Event()
+                    done.record(stream)
+                launched.append((i, done, (x, y)))
+            except Exception as e:
+                print(f"  Error using GPU {i}: {e}")
+        
+        for i, done, _buffers in launched:
+            try:
+                done.synchronize()
                 print(f"  Success! Matrix multiplication completed on GPU {i}")
-                # Clean up
-                del x, y
-                torch.cuda.empty_cache()
             except Exception as e:
                 print(f"  Error using GPU {i}: {e}")
     print_separator()
@@ -61,14 +168,26 @@ def main():
     # Print process information
     print("=== PROCESS INFORMATION ===")
     try:
-        process_info = subprocess.check_output(["ps", "-ef", "|", "grep", "python"], universal_newlines=True, shell=True)
-        print(process_info)
+        # Read /proc directly rather than forking ps and grep
+        for pid in sorted(filter(str.isdigit, os.listdir('/proc')), key=int):
+            try:
+                with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                    cmdline = f.read().replace(b'\x00', b' ').strip()
+            except OSError:
+                # The process exited while we were scanning
+                continue
+            if b'python' in cmdline:
+                print(pid, cmdline.decode(errors='replace'))
     except Exception as e:
         print(f"Error getting process info: {e}")
     
-    # Sleep to keep the job running so we can check nvidia-smi externally
-    print("\nSleeping for 30 seconds to allow checking nvidia-smi externally...")
-    time.sleep(30)
+    # Keep the job running so we can check nvidia-smi externally
+    hold_seconds = int(os.environ.get('DIAG_HOLD_SECONDS', 30))
+    if hold_seconds < 0:
+        print(f"DIAG_HOLD_SECONDS must not be negative, got {hold_seconds}")
+        return
+    print(f"\nHolding for up to {hold_seconds} seconds to allow checking nvidia-smi externally...")
+    hold(hold_seconds)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,25 +3,157 @@
 Simple client for the GPU scheduler with robust error handling
 """
 
-import argparse
-import requests
+# Heavier modules (argparse, requests, asyncio) are imported where they are
+# first needed, so the `list`/`gpus` fast path stays cheap to start
+import json
 import sys
 import os
-from datetime import datetime
+import shutil
+import time
+import urllib.parse
+from functools import lru_cache
+from types import SimpleNamespace
 
-def make_api_request(method, url, json_data=None):
-    """Make an API request with error handling"""
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+
+# (connect, read) timeout in seconds for API requests
+REQUEST_TIMEOUT = (3.05, 30)
+
+# Default for --cache-ttl
+DEFAULT_CACHE_TTL = 1.0
+
+# Threads for bulk operations; must not exceed the session's pool_maxsize
+BULK_WORKERS = 16
+
+# Seconds between checks for new output when following logs
+LOG_FOLLOW_INTERVAL = 1.0
+
+# Where the scheduler writes job output on this machine
+LOG_ROOT = os.path.join(os.path.expanduser("~"), "gpu-scheduler", "output")
+
+# Where recent GET responses are kept between invocations, one file per server
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "gpu-scheduler")
+
+def _make_session():
+    """Create a keep-alive session with a connection pool shared by all API requests"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.request import ACCEPT_ENCODING
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.1, status_forcelist=[502, 503, 504], raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['Connection'] = 'keep-alive'
+    # Every encoding urllib3 can decode here (gzip always; zstd/br when their packages are installed)
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    return session
+
+_SESSION = None
+
+def _get_session():
+    """Get the shared session, creating it on first use"""
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = _make_session()
+    return _SESSION
+
+@lru_cache(maxsize=None)
+def _endpoints(server):
+    """Build the API endpoint URLs for a server once; per-job URLs are templates taking job_id"""
+    return {
+        'jobs': f"{server}/jobs",
+        'batch': f"{server}/jobs/batch",
+        'stream': f"{server}/jobs/stream",
+        'gpus': f"{server}/gpus",
+        'job': f"{server}/jobs/{{job_id}}",
+        'cancel': f"{server}/jobs/{{job_id}}/cancel",
+        'log': f"{server}/jobs/{{job_id}}/log"
+    }
+
+@lru_cache(maxsize=4096)
+def _format_time(timestamp):
+    """Format a whole-second timestamp as local time (many jobs share the same second)"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
+
+def _post_json(url, json_data, **kwargs):
+    """POST a pre-serialized JSON body through the shared session"""
+    if json_data is None:
+        return _get_session().post(url, **kwargs)
+    return _get_session().post(url, data=_dumps(json_data), headers={'Content-Type': 'application/json'}, **kwargs)
+
+def _cache_file(url):
+    """Get the cache file for the server a URL belongs to"""
+    netloc = urllib.parse.urlsplit(url).netloc
+    return os.path.join(CACHE_DIR, ''.join(c if c.isalnum() else '_' for c in netloc) + '.json')
+
+def _load_cache(url):
+    """Read the unexpired cached GET responses for a server: {url: [expires_at, payload]}"""
+    try:
+        with open(_cache_file(url), 'rb') as f:
+            cache = _loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    now = time.time()
+    return {cached_url: entry for cached_url, entry in cache.items() if entry[0] > now}
+
+def _save_cache(url, cache):
+    """Write a server's cached GET responses; a failed write only costs a refetch"""
+    path = _cache_file(url)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Concurrent invocations each replace the whole file, so none sees a partial write
+        tmp_path = f"{path}.{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            f.write(_dumps(cache))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+def _invalidate_jobs_cache(url):
+    """Drop cached job responses for a server after this process changed job state"""
+    cache = _load_cache(url)
+    jobs_urls = [cached_url for cached_url in cache if '/jobs' in cached_url]
+    if jobs_urls:
+        for cached_url in jobs_urls:
+            del cache[cached_url]
+        _save_cache(url, cache)
+
+def make_api_request(method, url, json_data=None, cache_ttl=0):
+    """Make an API request with error handling, serving GETs from cache for up to cache_ttl seconds"""
+    if method.lower() == 'get' and cache_ttl > 0:
+        cached = _load_cache(url).get(url)
+        if cached:
+            return cached[1]
+    
     try:
         if method.lower() == 'get':
-            response = requests.get(url)
+            response = _get_session().get(url, timeout=REQUEST_TIMEOUT)
         elif method.lower() == 'post':
-            response = requests.post(url, json=json_data)
+            response = _post_json(url, json_data, timeout=REQUEST_TIMEOUT)
         else:
             print(f"Unsupported method: {method}")
             return None
         
         if response.status_code == 200:
-            return response.json()
+            result = _loads(response.content)
+            if method.lower() == 'get':
+                if cache_ttl > 0:
+                    cache = _load_cache(url)
+                    cache[url] = [time.time() + cache_ttl, result]
+                    _save_cache(url, cache)
+            elif '/jobs' in url:
+                _invalidate_jobs_cache(url)
+            return result
         else:
             print(f"Error: API returned {response.status_code} - {response.text}")
             return None
@@ -29,8 +161,50 @@ def make_api_request(method, url, json_data=None):
         print(f"Error connecting to server: {e}")
         return None
 
-def submit_job(args):
-    """Submit a job to the scheduler"""
+async def _async_api_request(client, method, url):
+    """Async counterpart of make_api_request"""
+    try:
+        response = await client.request(method.upper(), url)
+        if response.status_code == 200:
+            return _loads(response.content)
+        print(f"Error: API returned {response.status_code} - {response.text}")
+        return None
+    except Exception as e:
+        print(f"Error connecting to server: {e}")
+        return None
+
+async def _gather(api_requests):
+    """Send (method, url) API requests concurrently, multiplexed over HTTP/2 where the server supports it"""
+    import asyncio
+    import httpx
+    
+    limits = httpx.Limits(max_connections=8)
+    timeout = httpx.Timeout(REQUEST_TIMEOUT[1], connect=REQUEST_TIMEOUT[0])
+    try:
+        client = httpx.AsyncClient(http2=True, limits=limits, timeout=timeout)
+    except ImportError:
+        # HTTP/2 needs the optional h2 package; pooled HTTP/1.1 connections still work
+        client = httpx.AsyncClient(limits=limits, timeout=timeout)
+    async with client:
+        return await asyncio.gather(*(_async_api_request(client, method, url) for method, url in api_requests))
+
+def make_api_requests(api_requests):
+    """Make several (method, url) API requests concurrently, returning results in order"""
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        # Without httpx, send them one after another over the pooled session
+        return [make_api_request(method, url) for method, url in api_requests]
+    
+    import asyncio
+    results = asyncio.run(_gather(api_requests))
+    posted = [url for (method, url), result in zip(api_requests, results) if method.lower() == 'post' and result]
+    if posted:
+        _invalidate_jobs_cache(posted[0])
+    return results
+
+def _build_job_config(args):
+    """Build the job config payload from submit arguments"""
     # Parse environment variables
     env = {}
     if args.env:
@@ -55,44 +229,170 @@ def submit_job(args):
     if args.name:
         job_config["name"] = args.name
     
+    return job_config
+
+def submit_job(args):
+    """Submit a job to the scheduler"""
+    job_config = _build_job_config(args)
+    
     print(f"Submitting job with command: {args.command}")
     print(f"Options: {args.gpus} GPUs, Memory: {args.memory}GB, Priority: {args.priority}")
     
     # Send request
-    result = make_api_request('post', f"{args.server}/jobs", job_config)
+    result = make_api_request('post', _endpoints(args.server)['jobs'], job_config)
     if result:
         print(f"Job submitted with ID: {result['job_id']}")
         return True
     return False
 
+def submit_jobs(server, configs):
+    """Submit several jobs in a single request, returning their IDs"""
+    try:
+        response = _post_json(_endpoints(server)['batch'], {"jobs": configs}, timeout=REQUEST_TIMEOUT)
+    except Exception as e:
+        print(f"Error connecting to server: {e}")
+        return None
+    
+    if response.status_code == 404:
+        # Older servers have no batch endpoint, submit one job at a time
+        job_ids = []
+        for job_config in configs:
+            result = make_api_request('post', _endpoints(server)['jobs'], job_config)
+            if not result:
+                return None
+            job_ids.append(result['job_id'])
+        return job_ids
+    
+    if response.status_code != 200:
+        print(f"Error: API returned {response.status_code} - {response.text}")
+        return None
+    _invalidate_jobs_cache(_endpoints(server)['batch'])
+    return _loads(response.content)['job_ids']
+
+def submit_batch(args):
+    """Submit all jobs listed in a JSON file"""
+    try:
+        with open(args.file, 'r') as f:
+            configs = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error reading job file {args.file}: {e}")
+        return False
+    
+    # Accept either a plain list or the {"jobs": [...]} request body
+    if isinstance(configs, dict):
+        configs = configs.get("jobs", [])
+    if not isinstance(configs, list) or not configs:
+        print(f"No jobs found in {args.file}")
+        return False
+    
+    print(f"Submitting {len(configs)} jobs from {args.file}")
+    job_ids = submit_jobs(args.server, configs)
+    if job_ids is None:
+        return False
+    
+    for job_config, job_id in zip(configs, job_ids):
+        print(f"Job submitted with ID: {job_id} ({job_config.get('name') or job_config.get('command')})")
+    return True
+
 def list_jobs(args):
     """List all jobs"""
-    result = make_api_request('get', f"{args.server}/jobs")
+    if not args.details:
+        result = make_api_request('get', _endpoints(args.server)['jobs'], cache_ttl=args.cache_ttl)
+        if not result:
+            return False
+        _write_lines(_format_jobs_table(result.get("jobs", {})))
+        return True
+    
+    # Fetch full details, including recent output, for every job in one request
+    result = make_api_request('get', f"{_endpoints(args.server)['jobs']}?include=recent_output", cache_ttl=args.cache_ttl)
     if not result:
         return False
     
     jobs = result.get("jobs", {})
+    lines = [] if jobs else ["No jobs found."]
+    for i, (job_id, job) in enumerate(jobs.items()):
+        if i:
+            lines.append("=" * 40)
+        lines.extend(_format_job_status(job_id, job))
+    _write_lines(lines)
+    return True
+
+def _write_lines(lines):
+    """Write all lines to stdout in a single call"""
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+def _format_jobs_table(jobs):
+    """Format a one-line-per-job table"""
     if not jobs:
-        print("No jobs found.")
-        return True
+        return ["No jobs found."]
     
-    # Print header
-    print(f"{'JOB ID':<10} {'NAME':<20} {'STATUS':<10} {'GPUs':<10} {'SUBMITTED':<20}")
-    print("-" * 70)
+    # Header
+    lines = [
+        f"{'JOB ID':<10} {'NAME':<20} {'STATUS':<10} {'GPUs':<10} {'SUBMITTED':<20}",
+        "-" * 70
+    ]
     
-    # Print jobs
+    # Jobs
     for job_id, job in jobs.items():
         gpus_str = ','.join(map(str, job['assigned_gpus'] or [])) if job['assigned_gpus'] else '-'
         submit_time = job['submit_time']
-        submit_time_str = datetime.fromtimestamp(submit_time).strftime('%Y-%m-%d %H:%M:%S') if submit_time else '-'
+        submit_time_str = _format_time(int(submit_time)) if submit_time else '-'
         
-        print(f"{job_id:<10} {job['name'][:20]:<20} {job['status']:<10} {gpus_str:<10} {submit_time_str:<20}")
-    
-    return True
+        lines.append(f"{job_id:<10} {job['name'][:20]:<20} {job['status']:<10} {gpus_str:<10} {submit_time_str:<20}")
+    return lines
+
+def _render_watch(jobs):
+    """Redraw the job table in place"""
+    # Move the cursor home and clear the screen
+    _write_lines([
+        f"\033[H\033[JWatching jobs (updated {time.strftime('%H:%M:%S')}, Ctrl-C to stop)",
+        "",
+        *_format_jobs_table(jobs)
+    ])
+    sys.stdout.flush()
+
+def watch_jobs(args):
+    """Watch jobs live, redrawing the table whenever a job changes"""
+    try:
+        try:
+            response = _get_session().get(_endpoints(args.server)['stream'], stream=True, timeout=(REQUEST_TIMEOUT[0], None))
+        except Exception as e:
+            print(f"Error connecting to server: {e}")
+            return False
+        
+        if response.status_code == 200:
+            # Each line is a JSON job event; empty lines are keep-alives
+            jobs = {}
+            _render_watch(jobs)
+            partial = b''
+            for chunk in response.iter_content(chunk_size=None):
+                *lines, partial = (partial + chunk).split(b'\n')
+                events = [_loads(line) for line in lines if line]
+                for job in events:
+                    jobs[job['job_id']] = job
+                # Redraw once per chunk; the first one carries every job
+                if events:
+                    _render_watch(jobs)
+            print("Server closed the job stream.")
+            return True
+        response.close()
+        
+        # Servers without a stream endpoint are polled, redrawing only when something changed
+        previous = None
+        while True:
+            result = make_api_request('get', _endpoints(args.server)['jobs'], cache_ttl=args.cache_ttl)
+            if not result:
+                return False
+            if result != previous:
+                _render_watch(result.get("jobs", {}))
+                previous = result
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return True
 
 def get_job_status(args):
     """Get detailed job status"""
-    result = make_api_request('get', f"{args.server}/jobs/{args.job_id}")
+    result = make_api_request('get', _endpoints(args.server)['job'].format(job_id=args.job_id), cache_ttl=args.cache_ttl)
     if not result:
         return False
     
@@ -101,47 +401,106 @@ def get_job_status(args):
         print(f"Job {args.job_id} not found.")
         return False
     
-    # Print job details
-    print(f"Job ID: {args.job_id}")
-    print(f"Name: {job['name']}")
-    print(f"Status: {job['status']}")
-    print(f"Command: {job['command']}")
-    print(f"GPUs: {', '.join(map(str, job['assigned_gpus'] or []))}" if job['assigned_gpus'] else "GPUs: (not assigned)")
-    print(f"Memory Limit: {job['memory_limit']} GB")
+    _write_lines(_format_job_status(args.job_id, job))
+    return True
+
+def _format_job_status(job_id, job):
+    """Format the detailed view of one job"""
+    lines = [
+        f"Job ID: {job_id}",
+        f"Name: {job['name']}",
+        f"Status: {job['status']}",
+        f"Command: {job['command']}",
+        f"GPUs: {', '.join(map(str, job['assigned_gpus'] or []))}" if job['assigned_gpus'] else "GPUs: (not assigned)",
+        f"Memory Limit: {job['memory_limit']} GB"
+    ]
     
     if job['submit_time']:
-        submit_time = datetime.fromtimestamp(job['submit_time']).strftime('%Y-%m-%d %H:%M:%S')
-        print(f"Submit Time: {submit_time}")
+        lines.append(f"Submit Time: {_format_time(int(job['submit_time']))}")
     
     if job['start_time']:
-        start_time = datetime.fromtimestamp(job['start_time']).strftime('%Y-%m-%d %H:%M:%S')
-        print(f"Start Time: {start_time}")
+        lines.append(f"Start Time: {_format_time(int(job['start_time']))}")
         
     if job['end_time']:
-        end_time = datetime.fromtimestamp(job['end_time']).strftime('%Y-%m-%d %H:%M:%S')
-        print(f"End Time: {end_time}")
+        lines.append(f"End Time: {_format_time(int(job['end_time']))}")
         
     if job['exit_code'] is not None:
-        print(f"Exit Code: {job['exit_code']}")
+        lines.append(f"Exit Code: {job['exit_code']}")
         
     if 'recent_output' in job and job['recent_output']:
-        print("\nRecent Output:")
-        print("-" * 40)
-        print(job['recent_output'])
+        lines.extend(["", "Recent Output:", "-" * 40, job['recent_output']])
+    return lines
+
+def get_jobs_status(args):
+    """Get detailed status of several jobs in one request"""
+    query = urllib.parse.urlencode({'ids': ','.join(args.job_ids), 'include': 'recent_output'}, safe=',')
+    result = make_api_request('get', f"{_endpoints(args.server)['jobs']}?{query}", cache_ttl=args.cache_ttl)
+    if not result:
+        return False
     
-    return True
+    # Servers without ?ids= filtering return every job, so pick out the requested ones here
+    jobs = result.get("jobs", {})
+    lines = []
+    success = True
+    for i, job_id in enumerate(args.job_ids):
+        if i:
+            lines.append("=" * 40)
+        job = jobs.get(job_id)
+        if not job:
+            lines.append(f"Job {job_id} not found.")
+            success = False
+            continue
+        lines.extend(_format_job_status(job_id, job))
+    _write_lines(lines)
+    return success
+
+def cancel_many(server, job_ids):
+    """Cancel several jobs in parallel over the shared session, returning each job's result"""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    url = _endpoints(server)['cancel']
+    # Create the session up front so the worker threads share one connection pool
+    _get_session()
+    with ThreadPoolExecutor(max_workers=BULK_WORKERS) as executor:
+        return list(executor.map(lambda job_id: make_api_request('post', url.format(job_id=job_id)), job_ids))
+
+def _report_cancelled(job_ids, results):
+    """Print a one-line summary of a bulk cancel"""
+    failed = [job_id for job_id, result in zip(job_ids, results) if not result]
+    print(f"Cancelled {len(job_ids) - len(failed)} of {len(job_ids)} jobs.")
+    if failed:
+        print(f"Failed to cancel: {', '.join(failed)}")
+    return not failed
 
 def cancel_job(args):
-    """Cancel a specific job"""
-    result = make_api_request('post', f"{args.server}/jobs/{args.job_id}/cancel")
+    """Cancel one or more jobs"""
+    if len(args.job_ids) > 1:
+        return _report_cancelled(args.job_ids, cancel_many(args.server, args.job_ids))
+    
+    job_id = args.job_ids[0]
+    result = make_api_request('post', _endpoints(args.server)['cancel'].format(job_id=job_id))
     if result:
-        print(f"Job {args.job_id} cancelled successfully.")
+        print(f"Job {job_id} cancelled successfully.")
         return True
     return False
 
+def cancel_all_jobs(args):
+    """Cancel every queued and running job"""
+    result = make_api_request('get', _endpoints(args.server)['jobs'])
+    if not result:
+        return False
+    
+    job_ids = [job_id for job_id, job in result.get("jobs", {}).items() if job['status'] in ('queued', 'running')]
+    if not job_ids:
+        print("No queued or running jobs to cancel.")
+        return True
+    
+    results = make_api_requests([('post', _endpoints(args.server)['cancel'].format(job_id=job_id)) for job_id in job_ids])
+    return _report_cancelled(job_ids, results)
+
 def get_gpu_status(args):
     """Get GPU status"""
-    result = make_api_request('get', f"{args.server}/gpus")
+    result = make_api_request('get', _endpoints(args.server)['gpus'], cache_ttl=args.cache_ttl)
     if not result:
         return False
     
@@ -150,54 +509,144 @@ def get_gpu_status(args):
         print("No GPUs found.")
         return True
     
-    # Print header
-    print(f"{'GPU ID':<8} {'NAME':<20} {'MEMORY':<18} {'UTIL %':<8} {'TEMP':<6} {'JOB':<10}")
-    print("-" * 76)
+    # Header
+    lines = [
+        f"{'GPU ID':<8} {'NAME':<20} {'MEMORY':<18} {'UTIL %':<8} {'TEMP':<6} {'JOB':<10}",
+        "-" * 76
+    ]
     
-    # Print GPUs
+    # GPUs
     for gpu in gpus:
         memory_str = f"{gpu['used_memory']} / {gpu['total_memory']} MB"
         job_str = gpu['assigned_job_id'] or "Free" if gpu['is_available'] else "Busy"
         
-        print(f"{gpu['id']:<8} {gpu['name'][:20]:<20} {memory_str:<18} {gpu['utilization']:<8} {gpu['temperature']:<6} {job_str:<10}")
+        lines.append(f"{gpu['id']:<8} {gpu['name'][:20]:<20} {memory_str:<18} {gpu['utilization']:<8} {gpu['temperature']:<6} {job_str:<10}")
     
+    _write_lines(lines)
+    return True
+
+def _copy_log(path):
+    """Copy a log file to stdout without loading it into memory, returning the bytes copied"""
+    sys.stdout.flush()
+    with open(path, 'rb', buffering=65536) as f:
+        shutil.copyfileobj(f, sys.stdout.buffer, 65536)
+        sys.stdout.buffer.flush()
+        return f.tell()
+
+def _follow_logs(logs):
+    """Print output appended to (path, offset) logs to stdout until interrupted, like tail -f"""
+    # Regular files always look readable to select(), so poll for new data instead
+    files = []
+    for path, offset in logs:
+        f = open(path, 'rb')
+        f.seek(offset)
+        files.append(f)
+    
+    out = sys.stdout.buffer
+    try:
+        while True:
+            for f in files:
+                data = f.read(65536)
+                while data:
+                    out.write(data)
+                    data = f.read(65536)
+                out.flush()
+            time.sleep(LOG_FOLLOW_INTERVAL)
+    except KeyboardInterrupt:
+        return True
+    finally:
+        for f in files:
+            f.close()
+
+def _view_remote_log(args):
+    """Stream job logs from the server when they are not on this machine"""
+    for i, name in enumerate(('stdout', 'stderr')):
+        try:
+            response = _get_session().get(
+                _endpoints(args.server)['log'].format(job_id=args.job_id),
+                params={'file': name, 'stream': int(args.follow)},
+                stream=True,
+                timeout=(REQUEST_TIMEOUT[0], None if args.follow else REQUEST_TIMEOUT[1])
+            )
+        except Exception as e:
+            print(f"Error connecting to server: {e}")
+            return False
+        
+        if i == 0 and response.status_code == 404 and 'Job not found' in response.text:
+            response.close()
+            print(f"Log directory for job {args.job_id} not found")
+            return False
+        
+        if i:
+            print("")
+        print(f"=== {name.upper()} ===")
+        if response.status_code != 200:
+            response.close()
+            print(f"No {name} log found")
+            continue
+        
+        sys.stdout.flush()
+        try:
+            for chunk in response.iter_content(8192):
+                sys.stdout.buffer.write(chunk)
+                sys.stdout.buffer.flush()
+        except KeyboardInterrupt:
+            return True
+        finally:
+            response.close()
     return True
 
 def view_log(args):
     """View job logs"""
-    output_dir = os.path.expanduser(f"~/gpu-scheduler/output/{args.job_id}")
-    
-    if not os.path.isdir(output_dir):
-        print(f"Log directory for job {args.job_id} not found")
-        return False
+    # One directory scan finds both logs, or tells us they are not on this machine
+    try:
+        with os.scandir(os.path.join(LOG_ROOT, args.job_id)) as entries:
+            log_files = {entry.name: entry.path for entry in entries if entry.is_file()}
+    except (FileNotFoundError, NotADirectoryError):
+        return _view_remote_log(args)
         
-    stdout_file = os.path.join(output_dir, "stdout.txt")
-    stderr_file = os.path.join(output_dir, "stderr.txt")
+    stdout_file = log_files.get("stdout.txt")
+    stderr_file = log_files.get("stderr.txt")
+    follow = []
     
     print("=== STDOUT ===")
-    if os.path.isfile(stdout_file):
-        with open(stdout_file, 'r') as f:
-            print(f.read())
+    if stdout_file:
+        follow.append((stdout_file, _copy_log(stdout_file)))
     else:
         print("No stdout log found")
     
     print("")
     print("=== STDERR ===")
-    if os.path.isfile(stderr_file):
-        with open(stderr_file, 'r') as f:
-            print(f.read())
+    if stderr_file:
+        follow.append((stderr_file, _copy_log(stderr_file)))
     else:
         print("No stderr log found")
     
+    if args.follow and follow:
+        return _follow_logs(follow)
     return True
 
-def main():
-    # Default server URL
-    default_server = "http://localhost:9090"
+def _parse_fast_path(argv, default_server):
+    """Parse a bare `[--server URL] list|gpus` invocation without argparse, or return None"""
+    server = default_server
+    if len(argv) == 3 and argv[0] == '--server':
+        server, argv = argv[1], argv[2:]
+    if len(argv) != 1:
+        return None
+    
+    func = {'list': list_jobs, 'gpus': get_gpu_status}.get(argv[0])
+    if func is None:
+        return None
+    return SimpleNamespace(server=server, cache_ttl=DEFAULT_CACHE_TTL, details=False, func=func)
+
+def _build_parser(default_server):
+    """Build the full command line parser"""
+    import argparse
     
     # Main parser
     parser = argparse.ArgumentParser(description='GPU Scheduler Client')
     parser.add_argument('--server', default=default_server, help='Scheduler server URL')
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_CACHE_TTL, help='Seconds to reuse GET responses, across invocations (0 disables)')
     
     # Subparsers
     subparsers = parser.add_subparsers(dest='command', help='Command to run')
@@ -214,20 +663,40 @@ def main():
     submit_parser.add_argument('command', help='Command to run (use quotes for commands with spaces)')
     submit_parser.set_defaults(func=submit_job)
     
+    # Batch submit command
+    batch_parser = subparsers.add_parser('submit-batch', help='Submit all jobs from a JSON file in one request')
+    batch_parser.add_argument('--file', required=True, help='JSON file containing a list of job configs')
+    batch_parser.set_defaults(func=submit_batch)
+    
     # List command
     list_parser = subparsers.add_parser('list', help='List all jobs')
+    list_parser.add_argument('--details', action='store_true', help='Show full details and recent output for every job')
     list_parser.set_defaults(func=list_jobs)
     
+    # Watch command
+    watch_parser = subparsers.add_parser('watch', help='Watch job updates live')
+    watch_parser.add_argument('--interval', type=float, default=2.0, help='Polling interval in seconds for servers without streaming')
+    watch_parser.set_defaults(func=watch_jobs)
+    
     # Status command
     status_parser = subparsers.add_parser('status', help='Get job status')
     status_parser.add_argument('job_id', help='Job ID')
     status_parser.set_defaults(func=get_job_status)
     
+    # Status of several jobs
+    status_many_parser = subparsers.add_parser('status-many', help='Get status of several jobs at once')
+    status_many_parser.add_argument('job_ids', nargs='+', help='Job IDs')
+    status_many_parser.set_defaults(func=get_jobs_status)
+    
     # Cancel command
-    cancel_parser = subparsers.add_parser('cancel', help='Cancel a job')
-    cancel_parser.add_argument('job_id', help='Job ID')
+    cancel_parser = subparsers.add_parser('cancel', help='Cancel one or more jobs')
+    cancel_parser.add_argument('job_ids', nargs='+', metavar='job_id', help='Job IDs')
     cancel_parser.set_defaults(func=cancel_job)
     
+    # Cancel all command
+    cancel_all_parser = subparsers.add_parser('cancel-all', help='Cancel all queued and running jobs')
+    cancel_all_parser.set_defaults(func=cancel_all_jobs)
+    
     # GPU status command
     gpus_parser = subparsers.add_parser('gpus', help='Get GPU status')
     gpus_parser.set_defaults(func=get_gpu_status)
@@ -235,15 +704,25 @@ def main():
     # Log command
     log_parser = subparsers.add_parser('log', help='View job logs')
     log_parser.add_argument('job_id', help='Job ID')
+    log_parser.add_argument('-f', '--follow', action='store_true', help='Keep printing new output as it is written')
     log_parser.set_defaults(func=view_log)
     
-    # Parse arguments
-    args = parser.parse_args()
+    return parser
+
+def main():
+    # Default server URL
+    default_server = "http://localhost:9090"
     
-    # Check if command is specified
-    if not hasattr(args, 'func'):
-        parser.print_help()
-        return 1
+    # The most frequent (often scripted) commands take no options, so skip building the parser
+    args = _parse_fast_path(sys.argv[1:], default_server)
+    if args is None:
+        parser = _build_parser(default_server)
+        args = parser.parse_args()
+        
+        # Check if command is specified
+        if not hasattr(args, 'func'):
+            parser.print_help()
+            return 1
     
     # Execute command function
     success = args.func(args)
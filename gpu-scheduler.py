@@ -3,6 +3,7 @@
 Simple GPU Job Scheduler - A lightweight alternative to SLURM for local GPU management
 """
 
+import gzip
 import json
 import subprocess
 import threading
@@ -11,14 +12,33 @@ import os
 import argparse
 import logging
 import socket
-import queue
+import heapq
+import collections
 import signal
 import sys
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from typing import List, Dict, Optional, Any, Tuple
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import urllib.parse
 import shutil
+import shlex
+import resource
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import pynvml
+except ImportError:
+    pynvml = None
+
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+    def _dumps(obj):
+        return json.dumps(obj).encode()
 
 # Configure logging
 logging.basicConfig(
@@ -27,7 +47,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger("gpu-scheduler")
 
-@dataclass
+# Seconds between keep-alive lines on an idle job stream
+STREAM_KEEPALIVE = 15
+
+# Seconds between checks for new output when following a job log
+LOG_FOLLOW_INTERVAL = 1.0
+
+# Seconds an idle keep-alive connection is held open
+KEEPALIVE_TIMEOUT = 60
+
+# Largest request body accepted, in bytes
+MAX_BODY_SIZE = 1 << 20
+
+# JSON responses at least this many bytes are gzipped for clients that accept it
+GZIP_MIN_SIZE = 1024
+
+# Number of finished (completed, failed or cancelled) jobs kept for status queries
+JOB_ARCHIVE_SIZE = 1000
+
+# Bytes read from the end of a job's stdout to find its recent output
+OUTPUT_TAIL_BYTES = 64 * 1024
+
+# Characters that only a shell can interpret; commands containing any of them run under bash
+SHELL_METACHARS = frozenset('|&;<>()$`*?[]{}~#!\n')
+
+# Threads spawning job processes, so forks don't happen under the scheduler locks
+LAUNCH_WORKERS = 4
+
+# Slotted dataclasses (Python 3.10+) drop the per-instance __dict__
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class JobConfig:
     """Configuration for a job to be executed."""
     command: str
@@ -39,12 +89,12 @@ class JobConfig:
     name: str = None
     priority: int = 0  # Higher number = higher priority
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Job(JobConfig):
     """A job that is either queued or running."""
     job_id: str = None
     status: str = "queued"  # queued, running, completed, failed
-    assigned_gpus: List[int] = None
+    assigned_gpus: Tuple[int, ...] = None
     submit_time: float = None
     start_time: float = None
     end_time: float = None
@@ -53,7 +103,7 @@ class Job(JobConfig):
     output_file: Optional[str] = None
     error_file: Optional[str] = None
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class GPUInfo:
     """Information about a GPU."""
     id: int
@@ -67,81 +117,279 @@ class GPUInfo:
     is_available: bool = True
     assigned_job_id: Optional[str] = None
 
+# Field names for turning dataclasses into dicts without asdict's recursive deep copy
+_CONFIG_FIELDS = tuple(f.name for f in fields(JobConfig))
+_JOB_FIELDS = tuple(f.name for f in fields(Job))
+_GPU_FIELDS = tuple(f.name for f in fields(GPUInfo))
+
+def _fields_to_dict(obj, names) -> Dict[str, Any]:
+    """Shallow-copy the named fields of a dataclass instance into a dict."""
+    return {name: getattr(obj, name) for name in names}
+
+def _split_command(command: str, search_path: Optional[str] = None) -> Optional[List[str]]:
+    """Split a command into an argv that can be executed directly, or return None if it needs a shell."""
+    if any(c in SHELL_METACHARS for c in command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    # Variable assignments, builtins (cd, source, ...) and unknown commands are left to bash
+    if not argv or '=' in argv[0]:
+        return None
+    if '/' not in argv[0] and shutil.which(argv[0], path=search_path) is None:
+        return None
+    return argv
+
+def _encode_response(obj) -> Tuple[bytes, Optional[bytes]]:
+    """Encode a cached JSON response, along with its gzipped form when it is large enough to be sent compressed."""
+    payload = _dumps(obj)
+    return payload, gzip.compress(payload, compresslevel=6) if len(payload) >= GZIP_MIN_SIZE else None
+
+def _is_int(value) -> bool:
+    """Check for a JSON integer; bool is an int subclass but not a valid count or priority."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _job_config_error(config: Dict[str, Any]) -> Optional[str]:
+    """Describe what is wrong with a submitted job configuration, or return None if it is valid."""
+    unknown = [name for name in config if name not in _CONFIG_FIELDS]
+    if unknown:
+        return f"Unknown job fields: {', '.join(map(str, unknown))}"
+    command = config.get('command')
+    if not isinstance(command, str) or not command:
+        return 'command must be a non-empty string'
+    for name in ('num_gpus', 'memory_limit', 'priority'):
+        if name in config and not _is_int(config[name]):
+            return f'{name} must be an integer'
+    gpu_ids = config.get('gpu_ids')
+    if gpu_ids is not None and not (isinstance(gpu_ids, list) and all(map(_is_int, gpu_ids))):
+        return 'gpu_ids must be a list of integers'
+    env = config.get('env')
+    if env is not None and not (isinstance(env, dict) and all(isinstance(v, str) for v in env.values())):
+        return 'env must map strings to strings'
+    for name in ('working_dir', 'name'):
+        if config.get(name) is not None and not isinstance(config[name], str):
+            return f'{name} must be a string'
+    return None
+
 class GPUScheduler:
     """Manages GPU resources and job scheduling."""
     
     def __init__(self, poll_interval=10, min_free_memory=1000, max_gpu_util=10, max_used_memory=None):
-        self.jobs: Dict[str, Job] = {}
-        self.job_queue = queue.PriorityQueue()
+        self.jobs: Dict[str, Job] = {}  # queued and running jobs only
+        # Finished jobs, oldest first, with an index for lookups by ID
+        self.archive = collections.deque(maxlen=JOB_ARCHIVE_SIZE)
+        self._archived: Dict[str, Job] = {}
+        # Recent output per stdout path: {path: ((mtime, size), text)}
+        self._output_tail_cache: Dict[str, Tuple[Tuple[float, int], str]] = {}
+        # Heap of (-priority, submit_time, job_id)
+        self._heap: List[Tuple[int, float, str]] = []
         self.next_job_id = 1
         self.poll_interval = poll_interval  # seconds
         self.min_free_memory = min_free_memory  # MB
         self.max_gpu_util = max_gpu_util  # percent
         self.max_used_memory = max_used_memory  # MB (None means no limit)
-        self.lock = threading.RLock()
+        # _queue_lock guards the pending heap; _jobs_lock the job tables, job version and output cache;
+        # _gpus_lock the GPU table and assignments. When nesting, always take them in that order.
+        self._queue_lock = threading.Lock()
+        self._jobs_lock = threading.Lock()
+        self._gpus_lock = threading.Lock()
+        # Bumped on every job state change; drives ETags and the job stream
+        self.jobs_version = 0
+        self.jobs_changed = threading.Condition(self._jobs_lock)
+        self._etag_prefix = f"{int(time.time()):x}"
+        # Encoded responses for repeated polls: {name: (version key, (JSON bytes, gzipped bytes))}
+        self._json_cache: Dict[str, Tuple[Any, Tuple[bytes, Optional[bytes]]]] = {}
         self.gpus: Dict[int, GPUInfo] = {}
+        # The /gpus response, re-rendered whenever GPU info or assignments change
+        self._gpus_json = _encode_response({'gpus': []})
+        # Reverse index of running jobs: {gpu_id: job_id}
+        self._gpu_to_job: Dict[int, str] = {}
+        # Running job processes: {pid: job_id}
+        self._pid_to_job: Dict[int, str] = {}
+        # Their Popen objects, kept alive so that subprocess's own cleanup of discarded
+        # Popens (run on every later Popen call) never reaps a job before the SIGCHLD handler
+        self._processes: Dict[int, subprocess.Popen] = {}
+        # (pid, wait status) pairs collected by the SIGCHLD handler, drained by the monitor thread
+        self._reaped = collections.deque()
+        self._launcher = ThreadPoolExecutor(max_workers=LAUNCH_WORKERS, thread_name_prefix="launcher")
+        self._wake_event = threading.Event()
+        self._reaping = self._install_sigchld_handler()
         self.running = True
         self.output_dir = os.path.expanduser("~/gpu-scheduler/output")
         os.makedirs(self.output_dir, exist_ok=True)
+        self._nvml_handles = self._init_nvml()
+        # GPU attributes that never change: {gpu_id: (name, total_memory MB, power_limit W)}
+        self._static_gpu_info: Dict[int, Tuple[str, int, float]] = {}
         
         # Start the monitoring thread
         self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self.monitor_thread.start()
         
     def _get_job_id(self) -> str:
-        """Generate a unique job ID."""
-        with self.lock:
-            job_id = f"job{self.next_job_id}"
-            self.next_job_id += 1
-            return job_id
+        """Generate a unique job ID. Caller must hold the jobs lock."""
+        job_id = f"job{self.next_job_id}"
+        self.next_job_id += 1
+        return job_id
+    
+    def _assign_gpus(self, job_id: str, gpu_ids: List[int]):
+        """Mark GPUs as taken by a job."""
+        with self._gpus_lock:
+            for gpu_id in gpu_ids:
+                self._gpu_to_job[gpu_id] = job_id
+                if gpu_id in self.gpus:
+                    self.gpus[gpu_id].is_available = False
+                    self.gpus[gpu_id].assigned_job_id = job_id
+            self._render_gpus()
+    
+    def _release_gpus(self, gpu_ids: Optional[List[int]]):
+        """Free the GPUs a job was using."""
+        if not gpu_ids:
+            return
+        with self._gpus_lock:
+            for gpu_id in gpu_ids:
+                self._gpu_to_job.pop(gpu_id, None)
+                if gpu_id in self.gpus:
+                    self.gpus[gpu_id].assigned_job_id = None
+            self._render_gpus()
+    
+    def _archive_job(self, job_id: str):
+        """Move a finished job from the live table into the bounded archive. Caller must hold the jobs lock."""
+        job = self.jobs.pop(job_id)
+        if len(self.archive) == self.archive.maxlen:
+            evicted = self.archive[0]
+            self._archived.pop(evicted.job_id, None)
+            self._output_tail_cache.pop(evicted.output_file, None)
+        self.archive.append(job)
+        self._archived[job_id] = job
+    
+    def _find_job(self, job_id: str) -> Optional[Job]:
+        """Look up a live or archived job. Caller must hold the jobs lock."""
+        job = self.jobs.get(job_id)
+        return job if job is not None else self._archived.get(job_id)
+    
+    def _bump_jobs_version(self):
+        """Record a job state change and wake up any job stream waiters. Caller must hold the jobs lock."""
+        self.jobs_version += 1
+        self.jobs_changed.notify_all()
     
     def _monitor_loop(self):
         """Main monitoring loop that periodically checks GPU status and starts jobs."""
         while self.running:
             try:
-                self._update_gpu_info()
+                # Reap first so GPUs freed by finished jobs count as available in this pass
                 self._check_running_jobs()
+                self._update_gpu_info()
                 self._start_pending_jobs()
-                time.sleep(self.poll_interval)
             except Exception as e:
                 logger.error(f"Error in monitor loop: {e}", exc_info=True)
+            # A failing pass still waits, rather than retrying in a tight loop
+            self._wake_event.wait(self.poll_interval)
+            self._wake_event.clear()
+    
+    def _init_nvml(self) -> Optional[List[Any]]:
+        """Initialize NVML and cache a handle per GPU, or return None to fall back to nvidia-smi."""
+        if pynvml is None:
+            return None
+        try:
+            pynvml.nvmlInit()
+            return [pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(pynvml.nvmlDeviceGetCount())]
+        except pynvml.NVMLError as e:
+            logger.warning(f"NVML unavailable, falling back to nvidia-smi: {e}")
+            return None
+    
+    def _query_static_gpu_info(self) -> Dict[int, Tuple[str, int, float]]:
+        """Read the GPU attributes that never change, once, from NVML or nvidia-smi."""
+        static_info = {}
+        if self._nvml_handles is not None:
+            for gpu_id, handle in enumerate(self._nvml_handles):
+                name = pynvml.nvmlDeviceGetName(handle)
+                static_info[gpu_id] = (
+                    name.decode() if isinstance(name, bytes) else name,
+                    pynvml.nvmlDeviceGetMemoryInfo(handle).total // (1024 * 1024),
+                    pynvml.nvmlDeviceGetPowerManagementLimit(handle) / 1000.0
+                )
+            return static_info
+        
+        output = subprocess.check_output([
+            'nvidia-smi',
+            '--query-gpu=index,name,memory.total,power.limit',
+            '--format=csv,noheader,nounits'
+        ])
+        for line in output.splitlines():
+            parts = line.split(b',')
+            if len(parts) < 4:
+                continue
+            static_info[int(parts[0])] = (parts[1].strip().decode('utf-8'), int(float(parts[2])), float(parts[3]))
+        return static_info
+    
+    def _make_gpu_info(self, gpu_id: int, used_memory: int, utilization: int, temperature: int, power_usage: float) -> GPUInfo:
+        """Combine freshly polled GPU readings with the cached static attributes."""
+        name, total_memory, power_limit = self._static_gpu_info[gpu_id]
+        return GPUInfo(
+            id=gpu_id,
+            name=name,
+            total_memory=total_memory,
+            used_memory=used_memory,
+            utilization=utilization,
+            temperature=temperature,
+            power_usage=power_usage,
+            power_limit=power_limit
+        )
+    
+    def _query_gpus_nvml(self) -> List[GPUInfo]:
+        """Read current GPU information through NVML."""
+        gpus = []
+        for gpu_id, handle in enumerate(self._nvml_handles):
+            gpus.append(self._make_gpu_info(
+                gpu_id,
+                used_memory=pynvml.nvmlDeviceGetMemoryInfo(handle).used // (1024 * 1024),
+                utilization=pynvml.nvmlDeviceGetUtilizationRates(handle).gpu,
+                temperature=pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU),
+                power_usage=pynvml.nvmlDeviceGetPowerUsage(handle) / 1000.0
+            ))
+        return gpus
+    
+    def _query_gpus_smi(self) -> List[GPUInfo]:
+        """Read current GPU information by running nvidia-smi."""
+        output = subprocess.check_output([
+            'nvidia-smi', 
+            '--query-gpu=index,memory.used,utilization.gpu,temperature.gpu,power.draw', 
+            '--format=csv,noheader,nounits'
+        ])
+        
+        # int() and float() accept the padded byte fields directly, so nothing is decoded
+        gpus = []
+        for line in output.splitlines():
+            parts = line.split(b',')
+            if len(parts) < 5:
+                continue
+                
+            gpus.append(self._make_gpu_info(
+                int(parts[0]),
+                used_memory=int(float(parts[1])),
+                utilization=int(float(parts[2])),
+                temperature=int(float(parts[3])),
+                power_usage=float(parts[4])
+            ))
+        return gpus
     
     def _update_gpu_info(self):
-        """Update information about available GPUs using nvidia-smi."""
+        """Update information about available GPUs, using NVML when available and nvidia-smi otherwise."""
         try:
-            # Get GPU information using nvidia-smi
-            output = subprocess.check_output([
-                'nvidia-smi', 
-                '--query-gpu=index,name,memory.total,memory.used,utilization.gpu,temperature.gpu,power.draw,power.limit', 
-                '--format=csv,noheader,nounits'
-            ]).decode('utf-8').strip()
+            if not self._static_gpu_info:
+                self._static_gpu_info = self._query_static_gpu_info()
+            gpus = self._query_gpus_nvml() if self._nvml_handles is not None else self._query_gpus_smi()
             
-            with self.lock:
-                # Parse output
-                for line in output.split('\n'):
-                    parts = [p.strip() for p in line.split(',')]
-                    if len(parts) < 8:
-                        continue
-                        
-                    gpu_id = int(parts[0])
-                    gpu_info = GPUInfo(
-                        id=gpu_id,
-                        name=parts[1],
-                        total_memory=int(float(parts[2])),
-                        used_memory=int(float(parts[3])),
-                        utilization=int(float(parts[4])),
-                        temperature=int(float(parts[5])),
-                        power_usage=float(parts[6]),
-                        power_limit=float(parts[7]),
-                        is_available=True  # Will be updated below
-                    )
+            with self._gpus_lock:
+                for gpu_info in gpus:
+                    gpu_id = gpu_info.id
                     
                     # Check if this GPU is assigned to a job
-                    for job_id, job in self.jobs.items():
-                        if job.status == "running" and job.assigned_gpus and gpu_id in job.assigned_gpus:
-                            gpu_info.is_available = False
-                            gpu_info.assigned_job_id = job_id
-                            break
+                    assigned = self._gpu_to_job.get(gpu_id)
+                    if assigned is not None:
+                        gpu_info.is_available = False
+                        gpu_info.assigned_job_id = assigned
                             
                     # Also consider it unavailable if it's highly utilized or low on memory
                     free_memory = gpu_info.total_memory - gpu_info.used_memory
@@ -156,111 +404,145 @@ class GPUScheduler:
                             
                     # Update or add the GPU info
                     self.gpus[gpu_id] = gpu_info
+                self._render_gpus()
             
             logger.debug(f"Updated GPU info. Available GPUs: {[gpu.id for gpu in self.gpus.values() if gpu.is_available]}")
         except Exception as e:
             logger.error(f"Error updating GPU info: {e}", exc_info=True)
     
+    def _install_sigchld_handler(self) -> bool:
+        """Reap job processes as soon as they exit. Only possible from the main thread."""
+        try:
+            signal.signal(signal.SIGCHLD, self._reap_children)
+            return True
+        except (ValueError, AttributeError):
+            logger.warning("Could not install SIGCHLD handler; finished jobs are detected by polling")
+            return False
+    
+    def _reap_children(self, signum=None, frame=None):
+        """SIGCHLD handler. Must not take any scheduler lock, as it can interrupt a thread holding it."""
+        # Only job processes are waited for, so other children (nvidia-smi) are left to
+        # subprocess and their exits don't wake the monitor loop
+        reaped = False
+        for pid in list(self._pid_to_job):
+            try:
+                waited, status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                # Already reaped by a concurrent call
+                continue
+            if waited:
+                self._reaped.append((pid, status))
+                reaped = True
+        if reaped:
+            self._wake_event.set()
+    
+    def _finish_job(self, job: Job, status: Optional[int]):
+        """Mark a running job as completed and release its GPUs. Caller must hold the jobs lock."""
+        job.status = "completed"
+        job.end_time = time.time()
+        job.exit_code = os.WEXITSTATUS(status) if status is not None and os.WIFEXITED(status) else -1
+        self._pid_to_job.pop(job.pid, None)
+        process = self._processes.pop(job.pid, None)
+        if process is not None:
+            # Already reaped by us, so subprocess must not wait for it again
+            process.returncode = job.exit_code
+        
+        logger.info(f"Job {job.job_id} ({job.name}) completed with exit code {job.exit_code}")
+        self._archive_job(job.job_id)
+        self._bump_jobs_version()
+        
+        # Release GPU
+        self._release_gpus(job.assigned_gpus)
+    
     def _check_running_jobs(self):
         """Check the status of running jobs and update their status."""
-        with self.lock:
-            for job_id, job in list(self.jobs.items()):
-                if job.status == "running" and job.pid:
-                    try:
-                        # Check if the process is still running
-                        os.kill(job.pid, 0)
-                    except OSError:
-                        # Process is not running
-                        job.status = "completed"
-                        job.end_time = time.time()
-                        
-                        # Try to get exit code from the process if possible
-                        try:
-                            _, status = os.waitpid(job.pid, os.WNOHANG)
-                            job.exit_code = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -1
-                        except:
-                            job.exit_code = -1
-                            
-                        logger.info(f"Job {job_id} ({job.name}) completed with exit code {job.exit_code}")
-                        
-                        # Release GPU
-                        if job.assigned_gpus:
-                            for gpu_id in job.assigned_gpus:
-                                if gpu_id in self.gpus:
-                                    self.gpus[gpu_id].assigned_job_id = None
+        with self._jobs_lock:
+            # Without a SIGCHLD handler, poll for exits here. Unreaped children stay in /proc
+            # as zombies, so only waitpid can tell that a job has finished.
+            if not self._reaping:
+                self._reap_children()
+            
+            while self._reaped:
+                pid, status = self._reaped.popleft()
+                job_id = self._pid_to_job.get(pid)
+                if job_id is not None:
+                    self._finish_job(self.jobs[job_id], status)
     
     def _start_pending_jobs(self):
         """Check if there are any pending jobs that can be started."""
-        with self.lock:
+        with self._queue_lock, self._jobs_lock:
             # Get list of available GPUs
-            available_gpus = [gpu.id for gpu in self.gpus.values() if gpu.is_available]
+            with self._gpus_lock:
+                available_gpus = {gpu.id for gpu in self.gpus.values() if gpu.is_available}
             if not available_gpus:
                 return
                 
             # Check queue size
-            if self.job_queue.empty():
+            if not self._heap:
                 return
                 
-            # Try to start jobs from the queue
-            tried_jobs = []
-            while not self.job_queue.empty():
-                # Get next job from the queue based on priority
-                priority, timestamp, job_id = self.job_queue.get()
-                job = self.jobs[job_id]
+            # Try to start jobs from the queue, in priority order, without popping them
+            done = set()
+            for item in sorted(self._heap):
+                priority, timestamp, job_id = item
+                job = self.jobs.get(job_id)
                 
                 # Check if job is still queued
-                if job.status != "queued":
+                if job is None or job.status != "queued":
+                    done.add(item)
                     continue
                     
                 # If job requires specific GPUs, check if they're available
                 if job.gpu_ids:
-                    if not all(gpu_id in available_gpus for gpu_id in job.gpu_ids):
-                        # Put it back in the queue and try the next one
-                        tried_jobs.append((priority, timestamp, job_id))
+                    if not available_gpus.issuperset(job.gpu_ids):
+                        # Leave it in the queue and try the next one
                         continue
                     assigned_gpus = job.gpu_ids
                 else:
-                    # Assign required number of GPUs
+                    # Assign required number of GPUs, lowest IDs first
                     if len(available_gpus) < job.num_gpus:
                         # Not enough GPUs available
-                        tried_jobs.append((priority, timestamp, job_id))
                         continue
-                    assigned_gpus = available_gpus[:job.num_gpus]
+                    assigned_gpus = sorted(available_gpus)[:job.num_gpus]
                 
                 # Start the job since we have the necessary GPU(s)
                 self._launch_job(job, assigned_gpus)
+                done.add(item)
                 
                 # Update available GPUs
-                for gpu_id in assigned_gpus:
-                    available_gpus.remove(gpu_id)
+                available_gpus.difference_update(assigned_gpus)
                     
                 # If no more GPUs, break
                 if not available_gpus:
                     break
             
-            # Put tried jobs back in the queue
-            for job_item in tried_jobs:
-                self.job_queue.put(job_item)
+            # Sweep launched and stale entries out of the queue
+            if done:
+                self._heap = [item for item in self._heap if item not in done]
+                heapq.heapify(self._heap)
                 
     def _launch_job(self, job: Job, assigned_gpus: List[int]):
-        """Launch a job on the specified GPUs."""
+        """Reserve GPUs for a job and hand its process start to the launcher pool. Caller must hold the jobs lock."""
+        # Update job and GPUs
+        job.status = "running"
+        job.start_time = time.time()
+        job.assigned_gpus = tuple(assigned_gpus)
+        
+        # Mark GPUs as assigned
+        self._assign_gpus(job.job_id, assigned_gpus)
+        
+        # Set up output files
+        job_output_dir = os.path.join(self.output_dir, job.job_id)
+        job.output_file = os.path.join(job_output_dir, "stdout.txt")
+        job.error_file = os.path.join(job_output_dir, "stderr.txt")
+        
+        self._bump_jobs_version()
+        self._launcher.submit(self._spawn_job, job, assigned_gpus)
+    
+    def _spawn_job(self, job: Job, assigned_gpus: List[int]):
+        """Start a job's process. Runs on the launcher pool, outside the scheduler locks."""
         try:
-            # Update job and GPUs
-            job.status = "running"
-            job.start_time = time.time()
-            job.assigned_gpus = assigned_gpus
-            
-            # Mark GPUs as assigned
-            for gpu_id in assigned_gpus:
-                if gpu_id in self.gpus:
-                    self.gpus[gpu_id].is_available = False
-                    self.gpus[gpu_id].assigned_job_id = job.job_id
-            
-            # Set up output files
-            job_output_dir = os.path.join(self.output_dir, job.job_id)
-            os.makedirs(job_output_dir, exist_ok=True)
-            job.output_file = os.path.join(job_output_dir, "stdout.txt")
-            job.error_file = os.path.join(job_output_dir, "stderr.txt")
+            os.makedirs(os.path.dirname(job.output_file), exist_ok=True)
             
             # Prepare command environment
             env = os.environ.copy()
@@ -270,9 +552,13 @@ class GPUScheduler:
             # Set CUDA_VISIBLE_DEVICES
             env['CUDA_VISIBLE_DEVICES'] = ','.join(map(str, assigned_gpus))
             
-            # Prepare memory limit using cgroups or ulimit
+            # Prepare memory limit using cgroups or RLIMIT_AS
             memory_limit_mb = job.memory_limit * 1024  # Convert GB to MB
             
+            # Simple commands are executed directly instead of through bash
+            argv = _split_command(job.command, env.get('PATH'))
+            preexec_fn = None
+            
             # Create command to run with memory limits using systemd-run
             if shutil.which("systemd-run"):
                 # Using systemd-run which is more reliable for resource limits
@@ -281,71 +567,118 @@ class GPUScheduler:
                     "--user", 
                     "--scope", 
                     f"--property=MemoryLimit={job.memory_limit}G",
-                    "bash", "-c", job.command
+                    *(argv or ["bash", "-c", job.command])
                 ]
             else:
-                # Fallback to ulimit
-                launch_cmd = [
-                    "bash", "-c", 
-                    f"ulimit -v {memory_limit_mb * 1024} && {job.command}"
-                ]
+                # Fallback to an address space limit set in the child, as ulimit -v would,
+                # so shell commands need no extra ulimit step either
+                limit_bytes = memory_limit_mb * 1024 * 1024
+                launch_cmd = argv or ["bash", "-c", job.command]
+                preexec_fn = partial(resource.setrlimit, resource.RLIMIT_AS, (limit_bytes, limit_bytes))
             
-            # Open files for stdout and stderr
-            stdout_file = open(job.output_file, 'w')
-            stderr_file = open(job.error_file, 'w')
+            # Open stdout and stderr as raw close-on-exec descriptors; the child gets its own copies
+            flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC
+            stdout_fd = os.open(job.output_file, flags, 0o644)
+            stderr_fd = os.open(job.error_file, flags, 0o644)
             
             # Launch the process
             working_dir = job.working_dir or os.getcwd()
-            process = subprocess.Popen(
-                launch_cmd,
-                stdout=stdout_file,
-                stderr=stderr_file,
-                cwd=working_dir,
-                env=env,
-                start_new_session=True  # Create a new process group
-            )
-            
+            try:
+                process = subprocess.Popen(
+                    launch_cmd,
+                    stdout=stdout_fd,
+                    stderr=stderr_fd,
+                    cwd=working_dir,
+                    env=env,
+                    preexec_fn=preexec_fn,
+                    close_fds=True,
+                    pass_fds=(),
+                    start_new_session=True  # Create a new process group
+                )
+            finally:
+                os.close(stdout_fd)
+                os.close(stderr_fd)
+        except Exception as e:
+            logger.error(f"Error launching job {job.job_id}: {e}", exc_info=True)
+            with self._jobs_lock:
+                if job.status == "running":
+                    job.status = "failed"
+                    job.exit_code = -1
+                    job.end_time = time.time()
+                    # Free up GPUs
+                    self._release_gpus(assigned_gpus)
+                    self._archive_job(job.job_id)
+                    self._bump_jobs_version()
+            return
+        
+        with self._jobs_lock:
+            if job.status != "running":
+                # Cancelled while it was being started
+                try:
+                    os.killpg(process.pid, signal.SIGTERM)
+                except OSError:
+                    pass
+                return
             job.pid = process.pid
+            self._pid_to_job[job.pid] = job.job_id
+            self._processes[job.pid] = process
             logger.info(f"Started job {job.job_id} ({job.name}) on GPUs {assigned_gpus} with PID {job.pid}")
+            self._bump_jobs_version()
             
-        except Exception as e:
-            logger.error(f"Error launching job {job.job_id}: {e}", exc_info=True)
-            job.status = "failed"
-            job.exit_code = -1
-            job.end_time = time.time()
-            # Free up GPUs
-            for gpu_id in assigned_gpus:
-                if gpu_id in self.gpus:
-                    self.gpus[gpu_id].assigned_job_id = None
+            # Its SIGCHLD may have arrived before the PID was recorded
+            self._reap_children()
+    
+    def _make_job(self, config: JobConfig) -> Job:
+        """Build a queued job from its configuration; it gets an ID when it is added."""
+        job = Job(**_fields_to_dict(config, _CONFIG_FIELDS), status="queued")
+        
+        # Requested GPUs are fixed from here on
+        if job.gpu_ids:
+            job.gpu_ids = tuple(job.gpu_ids)
+        return job
+    
+    def _add_job(self, job: Job) -> str:
+        """Give a job its ID and queue it. Caller must hold the queue and jobs locks."""
+        job_id = self._get_job_id()
+        job.job_id = job_id
+        job.submit_time = time.time()
+        
+        # Set a default name if none provided
+        if not job.name:
+            job.name = f"job-{job_id}"
+        
+        # Add to priority queue (lower number = higher priority)
+        # Use negative priority so higher numbers have higher priority
+        heapq.heappush(self._heap, (-job.priority, job.submit_time, job_id))
+        
+        # Add to jobs dictionary only once it is queued, so a failure leaves nothing behind
+        self.jobs[job_id] = job
+        
+        logger.info(f"Submitted job {job_id} ({job.name})")
+        return job_id
     
     def submit_job(self, config: JobConfig) -> str:
         """Submit a new job to the queue."""
-        with self.lock:
-            job_id = self._get_job_id()
-            job = Job(
-                **asdict(config),
-                job_id=job_id,
-                status="queued",
-                submit_time=time.time()
-            )
-            
-            # Set a default name if none provided
-            if not job.name:
-                job.name = f"job-{job_id}"
-                
-            # Add to jobs dictionary
-            self.jobs[job_id] = job
-            
-            # Add to priority queue (lower number = higher priority)
-            # Use negative priority so higher numbers have higher priority
-            self.job_queue.put((-job.priority, job.submit_time, job_id))
-            
-            logger.info(f"Submitted job {job_id} ({job.name})")
-            return job_id
+        job = self._make_job(config)
+        with self._queue_lock, self._jobs_lock:
+            job_id = self._add_job(job)
+            self._bump_jobs_version()
+        # Let the monitor loop try to start it right away
+        self._wake_event.set()
+        return job_id
+    
+    def submit_jobs(self, configs: List[JobConfig]) -> List[str]:
+        """Submit several jobs to the queue at once; if any is invalid, none are queued."""
+        jobs = [self._make_job(config) for config in configs]
+        with self._queue_lock, self._jobs_lock:
+            job_ids = [self._add_job(job) for job in jobs]
+            self._bump_jobs_version()
+        self._wake_event.set()
+        return job_ids
     
     def cancel_job(self, job_id: str) -> bool:
         """Cancel a job if it exists and is not already completed."""
-        with self.lock:
+        with self._jobs_lock:
             if job_id not in self.jobs:
                 return False
                 
@@ -358,60 +691,179 @@ class GPUScheduler:
                     os.killpg(os.getpgid(job.pid), signal.SIGTERM)
                     job.status = "cancelled"
                     job.end_time = time.time()
+                    self._pid_to_job.pop(job.pid, None)
+                    self._processes.pop(job.pid, None)
                     
                     # Release GPUs
-                    if job.assigned_gpus:
-                        for gpu_id in job.assigned_gpus:
-                            if gpu_id in self.gpus:
-                                self.gpus[gpu_id].assigned_job_id = None
+                    self._release_gpus(job.assigned_gpus)
                     
                     logger.info(f"Cancelled running job {job_id}")
+                    self._archive_job(job_id)
+                    self._bump_jobs_version()
+                    # Its GPUs are free for queued jobs now
+                    self._wake_event.set()
                     return True
                 except Exception as e:
                     logger.error(f"Error cancelling job {job_id}: {e}", exc_info=True)
                     return False
+            elif job.status == "running":
+                # Still being started; the launcher kills the process as soon as it exists
+                job.status = "cancelled"
+                job.end_time = time.time()
+                self._release_gpus(job.assigned_gpus)
+                logger.info(f"Cancelled starting job {job_id}")
+                self._archive_job(job_id)
+                self._bump_jobs_version()
+                self._wake_event.set()
+                return True
             elif job.status == "queued":
                 # Job is in queue, just mark it as cancelled
                 job.status = "cancelled"
                 job.end_time = time.time()
                 logger.info(f"Cancelled queued job {job_id}")
+                self._archive_job(job_id)
+                self._bump_jobs_version()
                 return True
             
             return False
     
+    def _get_recent_output(self, job: Job) -> Optional[str]:
+        """Get the last 50 lines of a job's stdout, if it has any. Caller must hold the jobs lock."""
+        if not job.output_file:
+            return None
+        try:
+            st = os.stat(job.output_file)
+        except OSError:
+            return None
+        
+        # Reuse the previous tail while the file is unchanged
+        key = (st.st_mtime, st.st_size)
+        cached = self._output_tail_cache.get(job.output_file)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        offset = max(0, st.st_size - OUTPUT_TAIL_BYTES)
+        with open(job.output_file, 'rb') as f:
+            f.seek(offset)
+            lines = f.read().decode('utf-8', 'replace').splitlines(keepends=True)
+        if offset > 0:
+            lines = lines[1:]  # drop the partial first line
+        text = ''.join(lines[-50:])
+        self._output_tail_cache[job.output_file] = (key, text)
+        return text
+    
+    def _job_status(self, job: Job) -> Dict:
+        """Get status information, including recent output, for a job. Caller must hold the jobs lock."""
+        result = _fields_to_dict(job, _JOB_FIELDS)
+        
+        # Add output content if available
+        recent_output = self._get_recent_output(job)
+        if recent_output is not None:
+            result['recent_output'] = recent_output
+                
+        return result
+    
     def get_job_status(self, job_id: str) -> Optional[Dict]:
         """Get status information for a specific job."""
-        with self.lock:
-            if job_id not in self.jobs:
+        with self._jobs_lock:
+            job = self._find_job(job_id)
+            return self._job_status(job) if job is not None else None
+    
+    def get_job_log(self, job_id: str, stream: str = "stdout") -> Optional[Tuple[Optional[str], bool]]:
+        """Get the path of a job's stdout or stderr log and whether the job may still write to it."""
+        with self._jobs_lock:
+            job = self._find_job(job_id)
+            if job is None:
                 return None
-            
-            job = self.jobs[job_id]
-            result = asdict(job)
-            
-            # Add output content if available
-            if job.output_file and os.path.exists(job.output_file):
-                with open(job.output_file, 'r') as f:
-                    # Get the last 50 lines
-                    result['recent_output'] = ''.join(f.readlines()[-50:])
-                    
-            return result
+            path = job.output_file if stream == "stdout" else job.error_file
+            return path, job.status in ("queued", "running")
+    
+    def _all_jobs(self) -> Dict[str, Dict]:
+        """Get information about all jobs. Caller must hold the jobs lock."""
+        result = {job.job_id: _fields_to_dict(job, _JOB_FIELDS) for job in self.archive}
+        result.update((job_id, _fields_to_dict(job, _JOB_FIELDS)) for job_id, job in self.jobs.items())
+        return result
     
     def get_all_jobs(self) -> Dict[str, Dict]:
         """Get information about all jobs."""
-        with self.lock:
-            return {job_id: asdict(job) for job_id, job in self.jobs.items()}
+        with self._jobs_lock:
+            return self._all_jobs()
+    
+    def jobs_etag(self, version: Optional[int] = None) -> str:
+        """Get the ETag for the job listing at the given (default: current) version."""
+        if version is None:
+            version = self.jobs_version
+        return f'"{self._etag_prefix}-{version}"'
+    
+    def _jobs_snapshot(self, job_ids: Optional[List[str]] = None, include_output: bool = False) -> Tuple[int, Dict[str, Dict]]:
+        """Get the current job version and information about all (or the given) jobs. Caller must hold the jobs lock."""
+        if job_ids is None and not include_output:
+            return self.jobs_version, self._all_jobs()
+        
+        if job_ids is None:
+            job_ids = [job.job_id for job in self.archive] + list(self.jobs)
+        result = {}
+        for job_id in job_ids:
+            job = self._find_job(job_id)
+            if job is not None:
+                result[job_id] = self._job_status(job) if include_output else _fields_to_dict(job, _JOB_FIELDS)
+        return self.jobs_version, result
+    
+    def get_jobs_snapshot(self, job_ids: Optional[List[str]] = None, include_output: bool = False) -> Tuple[int, Dict[str, Dict]]:
+        """Get the current job version together with information about all (or the given) jobs."""
+        with self._jobs_lock:
+            return self._jobs_snapshot(job_ids, include_output)
+    
+    def wait_for_jobs_change(self, version: Optional[int], timeout: float) -> Tuple[int, Dict[str, Dict]]:
+        """Wait until the job version differs from the given one (or timeout) and return a snapshot."""
+        with self._jobs_lock:
+            if version is not None:
+                self.jobs_changed.wait_for(lambda: self.jobs_version != version or not self.running, timeout)
+            return self._jobs_snapshot()
+    
+    def _gpu_status(self) -> List[Dict]:
+        """Get status information for all GPUs. Caller must hold the GPUs lock."""
+        return [_fields_to_dict(gpu, _GPU_FIELDS) for gpu in self.gpus.values()]
     
     def get_gpu_status(self) -> List[Dict]:
         """Get status information for all GPUs."""
-        with self.lock:
-            return [asdict(gpu) for gpu in self.gpus.values()]
+        with self._gpus_lock:
+            return self._gpu_status()
+    
+    def _render_gpus(self):
+        """Encode the /gpus response from the current GPU table. Caller must hold the GPUs lock."""
+        self._gpus_json = _encode_response({'gpus': self._gpu_status()})
+    
+    def _cached_json(self, name: str, key: Any, build) -> Tuple[bytes, Optional[bytes]]:
+        """Get the encoded (and gzipped) JSON for a response, rebuilding it only when its key changed. Caller must hold the lock guarding it."""
+        cached = self._json_cache.get(name)
+        if cached is None or cached[0] != key:
+            cached = (key, _encode_response(build()))
+            self._json_cache[name] = cached
+        return cached[1]
+    
+    def get_jobs_json(self) -> Tuple[int, Tuple[bytes, Optional[bytes]]]:
+        """Get the current job version and the encoded (and gzipped) listing of all jobs."""
+        with self._jobs_lock:
+            return self.jobs_version, self._cached_json('jobs', self.jobs_version, lambda: {'jobs': self._all_jobs()})
+    
+    def get_gpus_json(self) -> Tuple[bytes, Optional[bytes]]:
+        """Get the encoded (and gzipped) status of all GPUs."""
+        return self._gpus_json
     
     def shutdown(self):
         """Shut down the scheduler and stop all running jobs."""
         logger.info("Shutting down scheduler...")
-        with self.lock:
+        with self._jobs_lock:
             self.running = False
-            
+            self.jobs_changed.notify_all()
+            self._wake_event.set()
+        
+        # Wait for monitor thread and in-flight launches to finish
+        self.monitor_thread.join(timeout=5)
+        self._launcher.shutdown(wait=True)
+        
+        with self._jobs_lock:
             # Cancel all running jobs
             for job_id, job in self.jobs.items():
                 if job.status == "running" and job.pid:
@@ -420,42 +872,179 @@ class GPUScheduler:
                     except:
                         pass
         
-        # Wait for monitor thread to finish
-        self.monitor_thread.join(timeout=5)
+        if self._nvml_handles is not None:
+            pynvml.nvmlShutdown()
         logger.info("Scheduler shutdown complete")
 
 class HTTPHandler(BaseHTTPRequestHandler):
     """HTTP request handler for the job scheduler API."""
     
+    # HTTP/1.1 keeps connections open between requests, so every response carries a Content-Length
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE_TIMEOUT
+    # Headers and body go out in separate writes; with Nagle on, a short body waits for the client's delayed ACK
+    disable_nagle_algorithm = True
+    # Set once a streamed response has sent its headers, after which errors can only drop the connection
+    _streaming = False
+    
     def __init__(self, *args, scheduler=None, **kwargs):
         self.scheduler = scheduler
         super().__init__(*args, **kwargs)
     
-    def _set_headers(self, status_code=200, content_type='application/json'):
+    def _set_headers(self, status_code=200, content_type='application/json', headers=None):
         self.send_response(status_code)
         self.send_header('Content-type', content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
         self.end_headers()
     
-    def _send_json_response(self, data, status_code=200):
-        self._set_headers(status_code)
-        self.wfile.write(json.dumps(data).encode())
+    def _send_json_response(self, data, status_code=200, headers=None):
+        self._send_json_bytes(_dumps(data), status_code, headers)
+    
+    def _send_json_bytes(self, payload, status_code=200, headers=None, gzipped=None):
+        """Send encoded JSON; cached responses pass their gzipped form so it isn't recompressed per request."""
+        headers = dict(headers or {}, Vary='Accept-Encoding')
+        if len(payload) >= GZIP_MIN_SIZE and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            payload = gzipped or gzip.compress(payload, compresslevel=6)
+            headers['Content-Encoding'] = 'gzip'
+        headers['Content-Length'] = str(len(payload))
+        self._set_headers(status_code, headers=headers)
+        self.wfile.write(payload)
+    
+    def _start_chunked_response(self, content_type):
+        """Start a streamed response; chunked transfer lets clients see each write as it happens."""
+        self._set_headers(200, content_type, {'Transfer-Encoding': 'chunked', 'Connection': 'close'})
+        self.close_connection = True
+        self._streaming = True
+    
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+    
+    def _stream_jobs(self):
+        """Stream job changes as newline-delimited JSON events until the client disconnects."""
+        self._start_chunked_response('application/x-ndjson')
+        sent = {}
+        version = None
+        try:
+            while self.scheduler.running:
+                version, jobs = self.scheduler.wait_for_jobs_change(version, STREAM_KEEPALIVE)
+                events = [job for job_id, job in jobs.items() if sent.get(job_id) != job]
+                for job in events:
+                    sent[job['job_id']] = job
+                # An empty line doubles as keep-alive when nothing changed
+                self._write_chunk(b''.join(_dumps(job) + b'\n' for job in events) or b'\n')
+            self._write_chunk(b'')
+        except OSError:
+            # Disconnected or stalled clients just end the stream
+            pass
+    
+    def _discard_body(self):
+        """Drop an unused request body so it isn't parsed as the next request on this connection."""
+        if 'Transfer-Encoding' in self.headers:
+            self.close_connection = True
+            return
+        try:
+            content_length = int(self.headers.get('Content-Length', '0'))
+        except ValueError:
+            content_length = -1
+        if 0 < content_length <= MAX_BODY_SIZE:
+            self.rfile.read(content_length)
+        elif content_length != 0:
+            self.close_connection = True
     
     def _parse_json_body(self):
-        content_length = int(self.headers['Content-Length'])
+        """Read the JSON request body, or send a 400 and return None if it is missing, too large or invalid."""
+        try:
+            content_length = int(self.headers.get('Content-Length', '0'))
+        except ValueError:
+            content_length = -1
+        if content_length <= 0 or content_length > MAX_BODY_SIZE:
+            # The body was not read, so the connection can't be reused
+            self.close_connection = True
+            self._send_json_response({'error': f'Content-Length must be between 1 and {MAX_BODY_SIZE}'}, 400)
+            return None
         post_data = self.rfile.read(content_length)
-        return json.loads(post_data.decode('utf-8'))
+        try:
+            return _loads(post_data)
+        except ValueError:
+            self._send_json_response({'error': 'Invalid JSON body'}, 400)
+            return None
+    
+    def _send_job_log(self, job_id, query):
+        """Send a job log from the given offset, optionally following it until the job ends."""
+        stream = query.get('file', ['stdout'])[0]
+        if stream not in ('stdout', 'stderr'):
+            self._send_json_response({'error': 'file must be stdout or stderr'}, 400)
+            return
+        offset = query.get('offset', ['0'])[0]
+        if not offset.isdecimal():
+            self._send_json_response({'error': 'offset must be a non-negative integer'}, 400)
+            return
+        offset = int(offset)
+        follow = query.get('stream', ['0'])[0] == '1'
+        
+        log = self.scheduler.get_job_log(job_id, stream)
+        if log is None:
+            self._send_json_response({'error': 'Job not found'}, 404)
+            return
+        path, active = log
+        if not path or not os.path.isfile(path):
+            self._send_json_response({'error': 'Log not found'}, 404)
+            return
+        
+        self._start_chunked_response('text/plain; charset=utf-8')
+        try:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                while True:
+                    data = f.read(65536)
+                    if data:
+                        self._write_chunk(data)
+                        continue
+                    if not follow or not active:
+                        break
+                    time.sleep(LOG_FOLLOW_INTERVAL)
+                    # Read once more after the job ends to pick up its final output
+                    _, active = self.scheduler.get_job_log(job_id, stream) or (None, False)
+            self._write_chunk(b'')
+        except OSError:
+            # Disconnected or stalled clients (and logs removed under us) just end the stream
+            pass
     
     def do_GET(self):
         """Handle GET requests."""
         parsed_path = urllib.parse.urlparse(self.path)
         path = parsed_path.path
+        self._discard_body()
         
         try:
             # Route handling
             if path == '/jobs':
-                # Get all jobs
-                jobs = self.scheduler.get_all_jobs()
-                self._send_json_response({'jobs': jobs})
+                # Get all (or ?ids=a,b,c) jobs, with ?include=recent_output adding each job's recent output
+                query = urllib.parse.parse_qs(parsed_path.query)
+                job_ids = query['ids'][0].split(',') if 'ids' in query else None
+                include_output = 'recent_output' in query.get('include', [''])[0].split(',')
+                
+                # Output changes don't bump the job version, so only listings without it get an ETag
+                if not include_output and self.headers.get('If-None-Match') == self.scheduler.jobs_etag():
+                    self._set_headers(304, headers={'Content-Length': '0'})
+                    return
+                if job_ids is None and not include_output:
+                    # Plain listings are served from the scheduler's encoded cache
+                    version, (payload, gzipped) = self.scheduler.get_jobs_json()
+                    self._send_json_bytes(payload, headers={'ETag': self.scheduler.jobs_etag(version)}, gzipped=gzipped)
+                    return
+                version, jobs = self.scheduler.get_jobs_snapshot(job_ids, include_output)
+                headers = None if include_output else {'ETag': self.scheduler.jobs_etag(version)}
+                self._send_json_response({'jobs': jobs}, headers=headers)
+            elif path == '/jobs/stream':
+                # Stream job updates
+                self._stream_jobs()
+            elif path.startswith('/jobs/') and path.endswith('/log'):
+                # Get (or follow) a job's output
+                job_id = path.split('/')[-2]
+                self._send_job_log(job_id, urllib.parse.parse_qs(parsed_path.query))
             elif path.startswith('/jobs/'):
                 # Get specific job
                 job_id = path.split('/')[-1]
@@ -466,13 +1055,32 @@ class HTTPHandler(BaseHTTPRequestHandler):
                     self._send_json_response({'error': 'Job not found'}, 404)
             elif path == '/gpus':
                 # Get GPU status
-                gpus = self.scheduler.get_gpu_status()
-                self._send_json_response({'gpus': gpus})
+                payload, gzipped = self.scheduler.get_gpus_json()
+                self._send_json_bytes(payload, gzipped=gzipped)
             else:
                 self._send_json_response({'error': 'Not found'}, 404)
         except Exception as e:
             logger.error(f"Error handling GET request: {e}", exc_info=True)
-            self._send_json_response({'error': str(e)}, 500)
+            if self._streaming:
+                # A second response would land inside the chunked body
+                self.close_connection = True
+            else:
+                self._send_json_response({'error': str(e)}, 500)
+    
+    def _build_job_configs(self, job_configs):
+        """Build JobConfigs from parsed JSON, sending a 400 and returning None if any is malformed."""
+        configs = []
+        for job_config in job_configs:
+            if not isinstance(job_config, dict):
+                self._send_json_response({'error': 'Job configuration must be a JSON object'}, 400)
+                return None
+            # Bad types would otherwise only fail later, in the queue or the monitor loop
+            error = _job_config_error(job_config)
+            if error:
+                self._send_json_response({'error': f'Invalid job configuration: {error}'}, 400)
+                return None
+            configs.append(JobConfig(**job_config))
+        return configs
     
     def do_POST(self):
         """Handle POST requests."""
@@ -484,10 +1092,29 @@ class HTTPHandler(BaseHTTPRequestHandler):
             if path == '/jobs':
                 # Submit a new job
                 job_config = self._parse_json_body()
-                job_id = self.scheduler.submit_job(JobConfig(**job_config))
+                if job_config is None:
+                    return
+                configs = self._build_job_configs([job_config])
+                if configs is None:
+                    return
+                job_id = self.scheduler.submit_job(configs[0])
                 self._send_json_response({'job_id': job_id})
+            elif path == '/jobs/batch':
+                # Submit several jobs in one request
+                body = self._parse_json_body()
+                if body is None:
+                    return
+                if not isinstance(body, dict) or not isinstance(body.get('jobs', []), list):
+                    self._send_json_response({'error': 'Request body must be an object with a list of jobs'}, 400)
+                    return
+                configs = self._build_job_configs(body.get('jobs', []))
+                if configs is None:
+                    return
+                job_ids = self.scheduler.submit_jobs(configs)
+                self._send_json_response({'job_ids': job_ids})
             elif path.startswith('/jobs/') and path.endswith('/cancel'):
                 # Cancel a job
+                self._discard_body()
                 job_id = path.split('/')[-2]
                 success = self.scheduler.cancel_job(job_id)
                 if success:
@@ -495,6 +1122,7 @@ class HTTPHandler(BaseHTTPRequestHandler):
                 else:
                     self._send_json_response({'error': 'Failed to cancel job'}, 400)
             else:
+                self._discard_body()
                 self._send_json_response({'error': 'Not found'}, 404)
         except Exception as e:
             logger.error(f"Error handling POST request: {e}", exc_info=True)
@@ -504,8 +1132,8 @@ def run_server(port=8000, poll_interval=30, min_free_memory=1000, max_gpu_util=1
     """Run the HTTP server."""    
     
     # Check if required tools are available
-    if not shutil.which("nvidia-smi"):
-        logger.error("nvidia-smi not found. This tool requires NVIDIA GPUs.")
+    if pynvml is None and not shutil.which("nvidia-smi"):
+        logger.error("Neither pynvml nor nvidia-smi found. This tool requires NVIDIA GPUs.")
         return
     
     # Create scheduler
@@ -520,7 +1148,8 @@ def run_server(port=8000, poll_interval=30, min_free_memory=1000, max_gpu_util=1
     def handler(*args, **kwargs):
         HTTPHandler(*args, scheduler=scheduler, **kwargs)
     
-    server = HTTPServer(('localhost', port), handler)
+    # Threaded so long-lived job streams don't block other requests
+    server = ThreadingHTTPServer(('localhost', port), handler)
     
     logger.info(f"Starting server on port {port}")
     try:
@@ -148,9 +148,13 @@ show_help() {
     echo ""
     echo "Usage:"
     echo "  gpujob submit [options] <command>   Submit a new job"
+    echo "  gpujob submit-batch --file <json>  Submit all jobs listed in a JSON file"
     echo "  gpujob list                        List all jobs"
+    echo "  gpujob watch                       Watch job updates live"
     echo "  gpujob status <job_id>             Show job status"
-    echo "  gpujob cancel <job_id>             Cancel a job"
+    echo "  gpujob status-many <job_id>...     Show status of several jobs"
+    echo "  gpujob cancel <job_id>...          Cancel one or more jobs"
+    echo "  gpujob cancel-all                  Cancel all queued and running jobs"
     echo "  gpujob gpus                        Show GPU status"
     echo "  gpujob log <job_id>                View job output log"
     echo ""
@@ -205,7 +209,7 @@ cmd="$1"
 shift || true
 
 case "$cmd" in
-    submit|list|status|cancel|gpus|log)
+    submit|submit-batch|list|watch|status|status-many|cancel|cancel-all|gpus|log)
         check_server || exit 1
         # Execute the command using the client with the detected port
         python3 "$CONFIG_DIR/gpu-scheduler-client.py" --server "http://localhost:$GPU_SCHEDULER_PORT" "$cmd" "$@"